@@ -2,7 +2,10 @@ import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import pandas as pd
 import os
-from fuzzywuzzy import process
+# rapidfuzz is a C++ replacement for fuzzywuzzy; it never falls back to the
+# pure-Python SequenceMatcher path. Unlike fuzzywuzzy it does NOT preprocess
+# strings by default, so matching calls pass utils.default_process explicitly.
+from rapidfuzz import process, utils
 
 STANDARD_PARAMS = {
     # --- Generic / commercial ---
@@ -376,14 +379,22 @@ def standardize_columns(df, mapping_dict, threshold=85):
         found = False
         for std_name, alternatives in mapping_dict.items():
             choices = [std_name] + alternatives
-            best_match, score = process.extractOne(str(col), choices)
-            if score >= threshold:
+            # score_cutoff lets rapidfuzz abandon a comparison mid-DP as
+            # soon as its upper bound drops below the threshold;
+            # default_process restores fuzzywuzzy's lowercase/strip behavior
+            best = process.extractOne(str(col), choices,
+                                      processor=utils.default_process,
+                                      score_cutoff=threshold)
+            if best is not None:
                 new_cols[col] = std_name
                 found = True
                 break
         if not found:
             new_cols[col] = col
-    return df.rename(columns=new_cols)
+    # Assigning df.columns swaps the axis labels in place; rename(columns=...)
+    # would copy every block of a frame we just loaded and own anyway
+    df.columns = [new_cols[col] for col in df.columns]
+    return df
 
 # === Combine duplicate columns ===
 def combine_duplicate_columns(df):
@@ -1,22 +1,327 @@
+import csv
+import functools
+import numpy as np
 import pandas as pd
 import re
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
+from rapidfuzz import fuzz, process
+import shutil
 import sys
 import os
+import threading
 from pathlib import Path
-import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog, ttk
+# tkinter is only needed for the interactive mode; it is imported lazily so
+# CLI batch runs (python standerlized2.py file.xlsx ...) never pay the Tcl/Tk
+# startup cost or carry the Tk libraries in memory.
+tk = None
+filedialog = None
+messagebox = None
+simpledialog = None
+ttk = None
 
-class MOSFETColumnMapper:
-    def __init__(self):
-        # Standard column names (target names)
-        self.standard_columns = {  # --- Generic / commercial ---
+
+def _import_tk():
+    """Load tkinter on first GUI use; CLI mode never calls this."""
+    global tk, filedialog, messagebox, simpledialog, ttk
+    if tk is None:
+        import tkinter as _tk
+        from tkinter import filedialog as _filedialog, messagebox as _messagebox, \
+            simpledialog as _simpledialog, ttk as _ttk
+        tk = _tk
+        filedialog = _filedialog
+        messagebox = _messagebox
+        simpledialog = _simpledialog
+        ttk = _ttk
+
+
+# Prefer the calamine engine (Rust parser) when available; it lists sheets and
+# parses large workbooks several times faster than the default openpyxl path.
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = "calamine"
+except ImportError:
+    _EXCEL_ENGINE = "openpyxl"
+
+try:
+    import xlsxwriter  # noqa: F401
+    _HAS_XLSXWRITER = True
+except ImportError:
+    _HAS_XLSXWRITER = False
+
+# pyarrow's C++ CSV writer formats wide frames several times faster than
+# pandas' Python-level to_csv; optional like the engines above.
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+
+# Compiled once; clean_column_name runs per column on every file/sheet and
+# re.sub with a string pattern pays a cache lookup on each call.
+_WS_RE = re.compile(r'\s+')
+_PREFIX_RE = re.compile(r'^(column|col|field)\s*[:\-_]?\s*')
+
+
+def _stream_mapped_excel(input_file, sheet_name, column_mapping, output_file,
+                         extra_column=None, extra_value=None):
+    """Copy a sheet to output_file with remapped headers, streaming row by row.
+
+    Rows go straight from the fastest available reader into xlsxwriter's
+    constant_memory writer (openpyxl write_only as fallback), so no DataFrame
+    is ever materialized and peak memory stays at one row.
+    """
+    # Truthiness, not an is-None check: the CLI passes "" as its sheet
+    # placeholder and the header read already treats that as "first sheet"
+    if not sheet_name:
+        sheet_name = _open_excel(input_file).sheet_names[0]
+
+    def iter_rows():
+        if _EXCEL_ENGINE == "calamine":
+            from python_calamine import CalamineWorkbook
+            wb_in = CalamineWorkbook.from_path(input_file)
+            yield from wb_in.get_sheet_by_name(sheet_name).iter_rows()
+        else:
+            import openpyxl
+            wb_in = openpyxl.load_workbook(input_file, read_only=True, data_only=True)
+            try:
+                yield from wb_in[sheet_name].iter_rows(values_only=True)
+            finally:
+                wb_in.close()
+
+    rows = iter_rows()
+    # next() with a default so an empty sheet writes an empty workbook
+    # instead of leaking StopIteration out of the save
+    header = [column_mapping.get(c, c) for c in next(rows, [])]
+    if extra_column:
+        header.append(extra_column)
+
+    if _HAS_XLSXWRITER:
+        # strings_to_* off: cell values are copied verbatim, so the
+        # per-string URL/formula scan is wasted work and would silently turn
+        # URL-looking text into hyperlink cells. default_date_format keeps
+        # datetime cells (e.g. "Release date") rendering as dates instead of
+        # bare serial numbers.
+        wb_out = xlsxwriter.Workbook(output_file,
+                                     {"constant_memory": True,
+                                      "strings_to_formulas": False,
+                                      "strings_to_urls": False,
+                                      "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+        try:
+            ws = wb_out.add_worksheet(sheet_name[:31])
+            ws.write_row(0, 0, header)
+            for i, row in enumerate(rows, 1):
+                if extra_column:
+                    row = list(row) + [extra_value]
+                ws.write_row(i, 0, row)
+        finally:
+            wb_out.close()
+    else:
+        from openpyxl import Workbook
+        wb_out = Workbook(write_only=True)
+        ws = wb_out.create_sheet(sheet_name[:31])
+        ws.append(header)
+        for row in rows:
+            if extra_column:
+                row = list(row) + [extra_value]
+            ws.append(row)
+        _save_workbook(wb_out, output_file)
+
+
+def _apply_mapping_and_save(input_file, sheet_name, column_mapping, output_file,
+                            extra_column=None, extra_value=None):
+    """Write input_file with remapped headers to output_file.
+
+    Single save path shared by the CLI and interactive flows so both inherit
+    the same engine choices: Excel-to-Excel streams row by row without a
+    DataFrame, everything else round-trips values as plain strings.
+    """
+    in_csv = input_file.lower().endswith('.csv')
+    out_csv = output_file.lower().endswith('.csv')
+
+    if not in_csv and not out_csv:
+        _stream_mapped_excel(input_file, sheet_name, column_mapping, output_file,
+                             extra_column, extra_value)
+        return
+
+    if in_csv and out_csv and not extra_column:
+        # Pure header rewrite: remap the first record, then block-copy the
+        # rest of the file byte-for-byte. No DataFrame, no per-row loop,
+        # O(1) memory regardless of file size.
+        with open(input_file, 'r', newline='') as src, \
+                open(output_file, 'w', newline='') as dst:
+            reader = csv.reader(src)
+            header = next(reader, [])
+            csv.writer(dst).writerow([column_mapping.get(c, c) for c in header])
+            shutil.copyfileobj(src, dst)
+        return
+
+    if in_csv:
+        df = pd.read_csv(input_file, dtype=str, na_filter=False)
+    else:
+        # parse(None) would return a dict of every sheet, and the CLI passes
+        # "" as its placeholder; default any falsy sheet to the first
+        df = _open_excel(input_file).parse(
+            sheet_name if sheet_name else 0,
+            dtype=str, na_filter=False)
+
+    # Mutate the headers in place; df is local and not reused
+    df.columns = [column_mapping.get(c, c) for c in df.columns]
+    if extra_column:
+        # Single-category Categorical: one int8 code per row instead of N
+        # identical Python string pointers, so the constant column costs
+        # ~1 byte per row; writers still emit the string on every row
+        df[extra_column] = pd.Categorical.from_codes(
+            np.zeros(len(df), dtype=np.int8), categories=[extra_value])
+
+    if out_csv:
+        if _HAS_PYARROW:
+            pa_csv.write_csv(pa.Table.from_pandas(df, preserve_index=False),
+                             output_file)
+        else:
+            df.to_csv(output_file, index=False)
+    elif _HAS_XLSXWRITER:
+        # Write the frame row by row straight into xlsxwriter. to_excel
+        # fills cells column-by-column, which is incompatible with
+        # constant_memory (rows flush once the writer moves past them), so
+        # drive the writer directly: one row in memory at a time, and no
+        # URL/formula scanning on string cells.
+        wb_out = xlsxwriter.Workbook(output_file,
+                                     {"constant_memory": True,
+                                      "strings_to_formulas": False,
+                                      "strings_to_urls": False,
+                                      "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+        try:
+            ws = wb_out.add_worksheet()
+            ws.write_row(0, 0, [str(c) for c in df.columns])
+            for i, row in enumerate(df.itertuples(index=False, name=None), 1):
+                ws.write_row(i, 0, row)
+        finally:
+            wb_out.close()
+    else:
+        df.to_excel(output_file, index=False)
+
+
+def _save_workbook(wb, output_file):
+    """Save a workbook through an in-memory buffer and one sequential write.
+
+    Packaging an .xlsx emits many small writes into the zip container; staging
+    them in a BytesIO and flushing once replaces them with a single large
+    sequential write, which is much cheaper on the OS write path.
+    """
+    import io
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    with open(output_file, 'wb') as f:
+        f.write(buffer.getbuffer())
+
+
+def _open_excel(path):
+    """Open an Excel file for reading with the fastest available engine."""
+    if _EXCEL_ENGINE == "calamine":
+        return pd.ExcelFile(path, engine="calamine")
+    # read_only avoids building the full openpyxl DOM just to read values
+    return pd.ExcelFile(path, engine="openpyxl",
+                        engine_kwargs={"read_only": True, "data_only": True})
+
+
+@functools.lru_cache(maxsize=4)
+def _open_excel_cached(path, mtime):
+    """Handle cache keyed by (path, mtime): re-picking the same file during
+    threshold tuning reuses the parsed workbook instead of re-unzipping it.
+    The mtime key drops stale entries when the file changes on disk."""
+    return _open_excel(path)
+
+
+@functools.lru_cache(maxsize=32)
+def _sheet_names_cached(path, mtime):
+    return tuple(_open_excel_cached(path, mtime).sheet_names)
+
+
+class _CsvIO:
+    """Input-side policy for .csv files; see _file_io.
+
+    The interactive flow used to branch on is_csv at every step; the two
+    policy classes keep the per-format load logic in one place each (the
+    save side is already centralized in _apply_mapping_and_save).
+    """
+    is_csv = True
+    default_suffix = "_mapped.csv"
+
+    @staticmethod
+    def open_handle(path):
+        return None
+
+    @staticmethod
+    def sheet_names(path, handle):
+        # CSV files don't have sheets, so present a dummy name
+        return ["CSV Data"]
+
+    @staticmethod
+    def read_header(path, sheet, handle):
+        return pd.read_csv(path, nrows=0)
+
+    @staticmethod
+    def read_formulas(path, sheet, header_df):
+        # CSVs carry no formulas, so there is nothing for the
+        # hyperlink-copy path to read
+        return None
+
+
+class _ExcelIO:
+    """Input-side policy for Excel files; see _file_io."""
+    is_csv = False
+    default_suffix = "_mapped.xlsx"
+
+    @staticmethod
+    def open_handle(path):
+        return _open_excel_cached(path, os.path.getmtime(path))
+
+    @staticmethod
+    def sheet_names(path, handle):
+        return handle.sheet_names
+
+    @staticmethod
+    def read_header(path, sheet, handle):
+        return handle.parse(sheet, nrows=0)
+
+    @staticmethod
+    def read_formulas(path, sheet, header_df):
+        # The formula-preserving pass only feeds hyperlink copying, so when
+        # no column name mentions a link/url the openpyxl parse is dead work
+        has_link_cols = any("link" in str(c).lower() or "url" in str(c).lower()
+                            for c in header_df.columns)
+        if not has_link_cols:
+            return None
+        # Formula pass with read_only streaming: iter_rows feeds
+        # from_records directly, so no intermediate list-of-lists and peak
+        # memory stays near the final frame size.
+        import openpyxl
+        workbook = openpyxl.load_workbook(path, data_only=False, read_only=True)
+        sheet_obj = workbook[sheet]
+        rows_iter = sheet_obj.iter_rows(values_only=True)
+        header = next(rows_iter, None)
+        df_formulas = pd.DataFrame.from_records(rows_iter, columns=header)
+        workbook.close()
+        return df_formulas
+
+
+_FILE_IO = {".csv": _CsvIO, ".xls": _ExcelIO, ".xlsx": _ExcelIO}
+
+
+def _file_io(path):
+    """Pick the input policy for a file by suffix (Excel as the default)."""
+    return _FILE_IO.get(Path(path).suffix.lower(), _ExcelIO)
+
+
+# Standard column names (target names): pure data shared by every mapper
+# instance, so build it (and the derived lookup tables) once at import.
+_STANDARD_COLUMNS = {  # --- Generic / commercial ---
     "Part Number": [
         "part no", "pn", "device", "type number", "partnumber", "type", "part number", 
         "p/n", "model", "type no", "type_number", "part_number", "typenum", "type_no"
     ],
-    "Manufacturer_real": [
+    "Manufacturer": [
         "manufacturer", "mfr", "brand", "company", "supplier", "vendor", "make", "maker"
     ],
     "Manufacturer_real": [
@@ -493,142 +798,380 @@ class MOSFETColumnMapper:
         "integrated features", "built-in features", "fail-safe", "hot-swap capability",
         "internal pull-ups", "fail-safe io", "hot-swap", "power sequencing"
     ]
-        }  
-        
+}
+
+
+def _build_lookup_tables():
+    """Derive the matching structures from _STANDARD_COLUMNS once.
+
+    Returns the lowercased alias -> standard lookup, a length-sorted view of
+    it (longest first so the most specific substring match wins), and the
+    flattened (choice, standard) lists rapidfuzz's batch scorers consume.
+    """
+    alias_to_std = {}
+    for standard_col, patterns in _STANDARD_COLUMNS.items():
+        alias_to_std.setdefault(standard_col.lower(), standard_col)
+        for pattern in patterns:
+            alias_to_std.setdefault(pattern.lower(), standard_col)
+    aliases_by_len = sorted(alias_to_std.items(), key=lambda item: -len(item[0]))
+
+    choices = []
+    choice_to_standard = []
+    for standard_col, patterns in _STANDARD_COLUMNS.items():
+        choices.append(standard_col.lower())
+        choice_to_standard.append(standard_col)
+        for pattern in patterns:
+            choices.append(pattern.lower())
+            choice_to_standard.append(standard_col)
+    return alias_to_std, aliases_by_len, choices, choice_to_standard
+
+
+_ALIAS_TO_STD, _ALIASES_BY_LEN, _CHOICES, _CHOICE_TO_STD = _build_lookup_tables()
+
+
+@functools.lru_cache(maxsize=8192)
+def _clean_and_probe(raw_name):
+    """Normalize a raw string header and probe the exact-alias table.
+
+    Fusing the normalization (lower/strip plus two regex subs) with the
+    dict probe into one cached call collapses the whole per-column fast
+    path to a single dict hit for repeated headers - and wide files and
+    multi-sheet runs are mostly repeats.
+    """
+    clean = _PREFIX_RE.sub('', _WS_RE.sub(' ', raw_name.lower().strip()))
+    return clean, _ALIAS_TO_STD.get(clean)
+
+
+class MOSFETColumnMapper:
+    def __init__(self):
+        # Bind the shared module-level tables; nothing here is mutated
+        # after construction, so instances are cheap to create (the batch
+        # pool builds one per worker).
+        self.standard_columns = _STANDARD_COLUMNS
+        self._alias_to_std = _ALIAS_TO_STD
+        self._aliases_by_len = _ALIASES_BY_LEN
+        self._choices = _CHOICES
+        self._choice_to_standard = _CHOICE_TO_STD
+
+        # 3-gram inverted index for candidate pruning. Only consulted once
+        # the alias vocabulary is big enough that scanning every choice
+        # dominates; at the current ~500 aliases a full C++ pass is faster
+        # than any prefilter, so the index stays disabled.
+        self._gram_index = None
+        if len(self._choices) >= 2000:
+            self._gram_index = self._build_gram_index()
+
+    @staticmethod
+    def _grams(text, n=3):
+        """Character n-gram shingles of a cleaned name."""
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def _build_gram_index(self):
+        index = {}
+        for j, choice in enumerate(self._choices):
+            for gram in self._grams(choice):
+                index.setdefault(gram, []).append(j)
+        return index
+
+    def _gram_candidates(self, clean_col):
+        """Choice indices sharing at least one 3-gram with the query.
+
+        Returns None when the query is too short to shingle or nothing
+        overlaps, in which case the caller scans the full choice list.
+        """
+        grams = self._grams(clean_col)
+        if not grams:
+            return None
+        candidates = set()
+        for gram in grams:
+            candidates.update(self._gram_index.get(gram, ()))
+        return sorted(candidates) or None
 
     def clean_column_name(self, col_name):
         """Clean and normalize column name for better matching"""
-        if pd.isna(col_name):
-            return ""
-        
-        # Convert to string and lowercase
-        clean_name = str(col_name).lower().strip()
-        
-        # Remove extra whitespace
-        clean_name = re.sub(r'\s+', ' ', clean_name)
-        
-        # Remove common prefixes/suffixes that might interfere
-        clean_name = re.sub(r'^(column|col|field)\s*[:\-_]?\s*', '', clean_name)
-        
-        return clean_name
+        # Headers are almost always plain strings; only non-str values need
+        # the pd.isna check (NaN, None, NaT headers from malformed sheets)
+        if not isinstance(col_name, str):
+            if pd.isna(col_name):
+                return ""
+            col_name = str(col_name)
+
+        return _clean_and_probe(col_name)[0]
+
+    def _fast_match(self, clean_col, threshold=70):
+        """Cheap non-fuzzy paths for an already-cleaned column name.
+
+        Real headers often just wrap a known alias in boilerplate
+        ("Operating Temperature Range (°C) max"), so a C-level substring test
+        resolves them without any Levenshtein work. Returns (standard, score)
+        or None when fuzzy scoring is still needed.
+        """
+        # O(1) exact probe first: most real vendor files hit a known alias
+        # verbatim, which needs no scoring at all
+        hit = self._alias_to_std.get(clean_col)
+        if hit is not None:
+            return hit, 100
+        if 95 >= threshold:
+            for alias, standard_col in self._aliases_by_len:
+                if min(len(alias), len(clean_col)) >= 4 and (alias in clean_col or clean_col in alias):
+                    return standard_col, 95
+        return None
 
     def find_best_match(self, column_name, threshold=70):
         """Find the best matching standard column for a given column name"""
         clean_col = self.clean_column_name(column_name)
-        
+
         if not clean_col:
             return None, 0
-        
+
+        # Vendor files repeat the same headers across sheets and batches, so
+        # memoize per cleaned name; standard_columns is immutable after init
+        return self._match_cached(clean_col, threshold)
+
+    @functools.lru_cache(maxsize=4096)
+    def _match_cached(self, clean_col, threshold):
+        """Match an already-cleaned column name (cached per name/threshold)."""
+        fast = self._fast_match(clean_col, threshold)
+        if fast:
+            return fast
+
         best_match = None
         best_score = 0
-        
-        for standard_col in self.standard_columns:
-            # Direct match with standard column
-            score = fuzz.ratio(clean_col, standard_col.lower())
-            if score > best_score:
-                best_score = score
-                best_match = standard_col
-            
-            # Match with alternative patterns
-            patterns = self.standard_columns.get(standard_col, [])
-            for pattern in patterns:
-                score = fuzz.ratio(clean_col, pattern.lower())
-                if score > best_score:
-                    best_score = score
-                    best_match = standard_col
-                
-                # Also try partial ratio for substring matches
-                partial_score = fuzz.partial_ratio(clean_col, pattern.lower())
-                if partial_score > best_score and partial_score >= threshold + 10:  # Higher threshold for partial matches
-                    best_score = partial_score
-                    best_match = standard_col
-        
-        return best_match if best_score >= threshold else None, best_score
+
+        # With a large vocabulary, prune to aliases sharing a 3-gram with
+        # the query before scoring; otherwise scan everything.
+        choices = self._choices
+        cand = None
+        if self._gram_index is not None:
+            cand = self._gram_candidates(clean_col)
+            if cand is not None:
+                choices = [self._choices[j] for j in cand]
+
+        # One C++ pass with WRatio, which folds the old ratio plus
+        # partial_ratio retry into a single weighted scorer (substring and
+        # ordering variance included), halving the DP work per comparison.
+        # processor=None: the choices were lowercased once in __init__ and
+        # clean_col is already normalized, so no per-call re-processing
+        result = process.extractOne(clean_col, choices, scorer=fuzz.WRatio,
+                                    processor=None, score_cutoff=threshold)
+        if result is not None:
+            _, best_score, best_idx = result
+            if cand is not None:
+                best_idx = cand[best_idx]
+            best_match = self._choice_to_standard[best_idx]
+
+        return best_match, best_score
 
     def map_columns(self, df, threshold=70):
         """Map all columns in the dataframe to standard column names"""
         column_mapping = {}
-        unmapped_columns = []
-        mapping_scores = {}
-        
-        for col in df.columns:
-            best_match, score = self.find_best_match(col, threshold)
-            if best_match:
-                column_mapping[col] = best_match
-                mapping_scores[col] = score
+        unmapped_idx = set()
+
+        cleaned = [self.clean_column_name(col) for col in df.columns]
+        # One contiguous score vector instead of N dict inserts; wrapped in a
+        # Series at the end so callers keep their [col]/.get/.items access
+        score_arr = np.zeros(len(cleaned))
+
+        # Resolve the cheap exact/substring paths per column first; only the
+        # remainder goes through the fuzzy similarity matrix.
+        pending = []
+        for i, (col, clean_col) in enumerate(zip(df.columns, cleaned)):
+            if not clean_col:
+                unmapped_idx.add(i)
+                continue
+            fast = self._fast_match(clean_col, threshold)
+            if fast:
+                column_mapping[col] = fast[0]
+                score_arr[i] = fast[1]
             else:
-                unmapped_columns.append(col)
-        
+                pending.append(i)
+
+        if pending:
+            # Full queries x aliases score matrix in multi-threaded C++
+            # instead of one Python-level find_best_match call per column;
+            # WRatio covers both the exact and substring scoring in one pass
+            queries = [cleaned[i] for i in pending]
+            # score_cutoff lets each comparison bail out mid-DP once its
+            # upper bound drops below the threshold; sub-cutoff cells read 0,
+            # which the >= threshold mask below treats as a miss anyway
+            scores = process.cdist(queries, self._choices,
+                                   scorer=fuzz.WRatio, workers=-1,
+                                   score_cutoff=threshold)
+            best_idx = scores.argmax(axis=1)
+            best_score = scores.max(axis=1)
+            score_arr[pending] = best_score
+
+            pending_arr = np.asarray(pending)
+            hit = best_score >= threshold
+            column_mapping.update(
+                zip(df.columns[pending_arr[hit]],
+                    (self._choice_to_standard[j] for j in best_idx[hit])))
+            unmapped_idx.update(pending_arr[~hit].tolist())
+
+        unmapped_columns = [col for i, col in enumerate(df.columns) if i in unmapped_idx]
+        mapping_scores = pd.Series(score_arr, index=df.columns)
         return column_mapping, unmapped_columns, mapping_scores
 
-    def process_excel_file(self, file_path, sheet_name=None, threshold=70, output_file=None):
-        """Process an Excel or CSV file and map its columns"""
+    def process_excel_file(self, file_path, sheet_name=None, threshold=70, output_file=None,
+                           excel_file=None, verbose=True):
+        """Process an Excel or CSV file and map its columns.
+
+        Only the header row is parsed here, so the returned frame carries the
+        renamed columns but zero data rows; the data itself is re-read by
+        _apply_mapping_and_save when output_file is given. Callers that need
+        the mapped rows in memory should load the file themselves and rename
+        with the returned mapping.
+
+        Pass an already-open pd.ExcelFile as excel_file to reuse its parsed
+        workbook (e.g. the handle get_sheet_names listed sheets from) instead
+        of opening the zip container a second time. verbose=False silences
+        the per-column report (useful for batch runs).
+        """
         try:
-            # Check if it's a CSV file
-            is_csv = file_path.lower().endswith('.csv')
-            
-            # Read file based on type
-            if is_csv:
-                df = pd.read_csv(file_path)
-                print(f"Loaded CSV file: {file_path}")
-            else:
-                # Read Excel file
-                if sheet_name:
-                    df = pd.read_excel(file_path, sheet_name=sheet_name)
-                else:
-                    df = pd.read_excel(file_path)
-                print(f"Loaded Excel file: {file_path}")
-            
-            print(f"Original columns: {len(df.columns)}")
-            print("-" * 50)
-            
+            file_io = _file_io(file_path)
+
+            # Mapping only needs the header row, so read nrows=0 and let
+            # _apply_mapping_and_save re-read the body when saving. On large
+            # workbooks this turns a multi-second parse into milliseconds.
+            if not file_io.is_csv and excel_file is None:
+                excel_file = _open_excel(file_path)
+            df = file_io.read_header(file_path, sheet_name if sheet_name else 0,
+                                     excel_file)
+
             # Map columns
             column_mapping, unmapped_columns, mapping_scores = self.map_columns(df, threshold)
+
+            # Build the whole report in memory and emit it with one write;
+            # one print per column means one stdout lock + syscall per line,
+            # which adds up on 200+ column workbooks
+            if verbose:
+                lines = [f"Loaded {'CSV' if file_io.is_csv else 'Excel'} file: {file_path}",
+                         f"Original columns: {len(df.columns)}",
+                         "-" * 50,
+                         "COLUMN MAPPING RESULTS:",
+                         "=" * 50]
+                if column_mapping:
+                    lines.append(f"\nMAPPED COLUMNS ({len(column_mapping)}):")
+                    for original, mapped in column_mapping.items():
+                        score = mapping_scores[original]
+                        lines.append(f"  '{original}' -> '{mapped}' (confidence: {score:.1f}%)")
+                if unmapped_columns:
+                    lines.append(f"\nUNMAPPED COLUMNS ({len(unmapped_columns)}):")
+                    lines.extend(f"  '{col}'" for col in unmapped_columns)
+                sys.stdout.write("\n".join(lines) + "\n")
+
+            # Rename in place on the header frame: df isn't used under its
+            # old headers again, so skip the copy rename(columns=...) builds
+            df.columns = [column_mapping.get(c, c) for c in df.columns]
+            mapped_df = df
             
-            # Display results
-            print("COLUMN MAPPING RESULTS:")
-            print("=" * 50)
-            
-            if column_mapping:
-                print(f"\nMAPPED COLUMNS ({len(column_mapping)}):")
-                for original, mapped in column_mapping.items():
-                    score = mapping_scores[original]
-                    print(f"  '{original}' -> '{mapped}' (confidence: {score:.1f}%)")
-            
-            if unmapped_columns:
-                print(f"\nUNMAPPED COLUMNS ({len(unmapped_columns)}):")
-                for col in unmapped_columns:
-                    print(f"  '{col}'")
-            
-            # Create mapped dataframe
-            mapped_df = df.rename(columns=column_mapping)
-            
-            # Save to new file if output path provided
+            # Save to new file if output path provided (same fast path as the
+            # interactive flow - streams Excel-to-Excel without a DataFrame)
             if output_file:
-                if output_file.lower().endswith('.csv'):
-                    mapped_df.to_csv(output_file, index=False)
-                    print(f"\nMapped dataframe saved to: {output_file}")
-                else:
-                    mapped_df.to_excel(output_file, index=False)
+                _apply_mapping_and_save(file_path, sheet_name, column_mapping, output_file)
+                if verbose:
                     print(f"\nMapped dataframe saved to: {output_file}")
             
             return mapped_df, column_mapping, unmapped_columns, mapping_scores
-            
+
         except Exception as e:
             print(f"Error processing file: {str(e)}")
             return None, None, None, None
 
+    def process_excel_files(self, file_paths, threshold=70, workers=None):
+        """Process several files in parallel worker processes.
+
+        Mapping only reads the alias tables, so files are embarrassingly
+        parallel; each worker builds its own mapper once via the pool
+        initializer. Returns {path: process_excel_file result}.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        if not file_paths:
+            return {}
+        if workers is None:
+            workers = min(len(file_paths), os.cpu_count() or 1)
+
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker) as pool:
+            futures = {path: pool.submit(_process_file_worker, path, threshold)
+                       for path in file_paths}
+            return {path: future.result() for path, future in futures.items()}
+
+
+# Per-process mapper for the batch pool; the initializer builds it once so
+# every job in that worker skips alias-table construction.
+_MAPPER = None
+
+
+def _init_worker():
+    global _MAPPER
+    _MAPPER = MOSFETColumnMapper()
+
+
+def _process_file_worker(file_path, threshold):
+    # verbose=False: parallel workers share stdout, so the multi-line
+    # per-column reports would interleave
+    return _MAPPER.process_excel_file(file_path, threshold=threshold,
+                                      verbose=False)
+
+
+# Small labeled sample of realistic (mangled) vendor headers used to pick a
+# default matching threshold: positives should still map to their standard
+# column, negatives should stay unmapped.
+_CALIBRATION_SAMPLE = [
+    ("part numbr", "Part Number"),
+    ("manufacturor", "Manufacturer"),
+    ("continuous drain currant", "ID [max] (A)"),
+    ("drain source voltage", "VDS [max] (V)"),
+    ("gate charg total", "QG(tot) [typ] @ VGS = 10 V (nC)"),
+    ("data sheet", "Datasheet Link"),
+    ("internal review notes", None),
+    ("approval status flag", None),
+    ("row checksum", None),
+]
+
+
 class InteractiveColumnMapper:
     def __init__(self):
+        _import_tk()
         self.mapper = MOSFETColumnMapper()
-        self.root = None
+        # Empirically grounded default for the threshold dialog; computed
+        # once per session from the labeled sample above.
+        self._default_threshold = self._calibrate_threshold()
+        # One hidden root shared by every dialog: each tk.Tk() call would spin
+        # up a fresh Tcl interpreter, so create a single withdrawn root once
+        # and hang Toplevels/file dialogs off it instead.
+        self.root = tk.Tk()
+        self.root.withdraw()
+        # Session cache of parsed (header_df, df_formulas) keyed by
+        # (path, mtime, sheet), so re-running the same file (e.g. to try a
+        # different threshold) skips the re-parse. Capped to bound memory.
+        self._df_cache = {}
+        # The preview window is built lazily on first use and then reused;
+        # _preview_state carries the per-file data its handlers read.
+        self._preview = None
+        self._preview_state = {}
+
+    def _cache_get(self, path, sheet):
+        """Return (key, cached value) for a file/sheet; value is None on miss."""
+        try:
+            key = (path, os.path.getmtime(path), sheet)
+        except OSError:
+            return None, None
+        return key, self._df_cache.get(key)
+
+    def _cache_put(self, key, value, max_entries=2):
+        if key is None:
+            return
+        self._df_cache[key] = value
+        while len(self._df_cache) > max_entries:
+            self._df_cache.pop(next(iter(self._df_cache)))
         
     def select_input_file(self):
         """Open file dialog to select input Excel or CSV file"""
-        root = tk.Tk()
-        root.withdraw()  # Hide the main window
-        
-        file_path = filedialog.askopenfilename(
+        return filedialog.askopenfilename(
+            parent=self.root,
             title="Select Input File (Excel or CSV)",
             filetypes=[
                 ("Excel files", "*.xlsx *.xls"),
@@ -636,19 +1179,19 @@ class InteractiveColumnMapper:
                 ("All files", "*.*")
             ]
         )
-        root.destroy()
-        return file_path
     
-    def get_sheet_names(self, file_path):
+    def get_sheet_names(self, file_path, excel_file=None):
         """Get all sheet names from Excel file or return None for CSV"""
         try:
             # Check if it's a CSV file
             if file_path.lower().endswith('.csv'):
                 return ["CSV Data"]  # CSV files don't have sheets, so we create a dummy name
-            
-            # For Excel files, get actual sheet names
-            excel_file = pd.ExcelFile(file_path)
-            return excel_file.sheet_names
+
+            # For Excel files, get actual sheet names (reusing an open
+            # handle when the caller has one, to avoid re-parsing the zip)
+            if excel_file is not None:
+                return excel_file.sheet_names
+            return list(_sheet_names_cached(file_path, os.path.getmtime(file_path)))
         except Exception as e:
             print(f"Error reading file: {str(e)}")
             return []
@@ -658,7 +1201,9 @@ class InteractiveColumnMapper:
         if len(sheet_names) == 1:
             return sheet_names[0]
         
-        root = tk.Tk()
+        # Toplevel off the shared hidden root: reuses the Tcl interpreter
+        # instead of spinning up (and tearing down) a fresh one per dialog
+        root = tk.Toplevel(self.root)
         root.title("Select Sheet")
         root.geometry("300x200")
         
@@ -668,10 +1213,10 @@ class InteractiveColumnMapper:
             selection = listbox.curselection()
             if selection:
                 selected_sheet[0] = sheet_names[selection[0]]
-                root.quit()
+                root.destroy()
         
         def on_cancel():
-            root.quit()
+            root.destroy()
         
         # Check if it's a CSV file (single sheet with dummy name)
         if len(sheet_names) == 1 and sheet_names[0] == "CSV Data":
@@ -699,32 +1244,57 @@ class InteractiveColumnMapper:
         tk.Button(button_frame, text="Select", command=on_select).pack(side=tk.LEFT, padx=5)
         tk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.LEFT, padx=5)
         
-        root.mainloop()
-        root.destroy()
+        root.wait_window()
         
         return selected_sheet[0]
     
+    def _calibrate_threshold(self, samples=_CALIBRATION_SAMPLE):
+        """Pick the threshold that maximizes F1 over the labeled sample.
+
+        A grounded default means fewer full re-runs with a hand-tuned
+        threshold, which are the expensive part of the interactive loop.
+        Sweeps coarse 5-point steps; ties keep the most permissive
+        threshold, since false misses are what send users back for a
+        re-run.
+        """
+        best_threshold, best_f1 = 70, -1.0
+        for threshold in range(50, 95, 5):
+            tp = fp = fn = 0
+            for header, expected in samples:
+                predicted, _ = self.mapper.find_best_match(header, threshold)
+                if predicted is None:
+                    if expected is not None:
+                        fn += 1
+                elif predicted == expected:
+                    tp += 1
+                else:
+                    fp += 1
+                    if expected is not None:
+                        fn += 1
+            denom = 2 * tp + fp + fn
+            f1 = 2 * tp / denom if denom else 0.0
+            if f1 > best_f1:
+                best_threshold, best_f1 = threshold, f1
+        return best_threshold
+
     def get_threshold_dialog(self):
         """Dialog to get matching threshold"""
-        root = tk.Tk()
-        root.withdraw()
-        
+        default = self._default_threshold
         threshold = simpledialog.askinteger(
             "Matching Threshold",
-            "Enter matching threshold (0-100):\nHigher values = stricter matching\nRecommended: 70",
-            initialvalue=70,
+            "Enter matching threshold (0-100):\nHigher values = stricter matching"
+            f"\nRecommended: {default}",
+            initialvalue=default,
             minvalue=0,
-            maxvalue=100
+            maxvalue=100,
+            parent=self.root
         )
-        root.destroy()
-        return threshold if threshold is not None else 70
+        return threshold if threshold is not None else default
     
     def select_output_location(self, default_name):
         """Dialog to select output Excel file location and name"""
-        root = tk.Tk()
-        root.withdraw()
-        
-        output_path = filedialog.asksaveasfilename(
+        return filedialog.asksaveasfilename(
+            parent=self.root,
             title="Save Mapped Excel File As",
             defaultextension=".xlsx",
             initialfile=default_name,
@@ -733,15 +1303,11 @@ class InteractiveColumnMapper:
                 ("All files", "*.*")
             ]
         )
-        root.destroy()
-        return output_path
     
     def select_csv_output_location(self, default_name):
         """Dialog to select output CSV file location and name"""
-        root = tk.Tk()
-        root.withdraw()
-        
-        output_path = filedialog.asksaveasfilename(
+        return filedialog.asksaveasfilename(
+            parent=self.root,
             title="Save Mapped CSV File As",
             defaultextension=".csv",
             initialfile=default_name,
@@ -750,28 +1316,78 @@ class InteractiveColumnMapper:
                 ("All files", "*.*")
             ]
         )
-        root.destroy()
-        return output_path
     
-    def show_preview_dialog(self, df_formulas, column_mapping, unmapped_columns, mapping_scores):
-        """Show preview of column mappings, allow editing, and copy hyperlinks."""
-        root = tk.Tk()
-        root.title("Column Mapping Preview & Edit")
-        root.geometry("850x700")
+    def _run_with_progress(self, work_fn, title="Saving..."):
+        """Run work_fn on a worker thread while an indeterminate progress bar
+        keeps the UI alive; returns work_fn's result and re-raises any
+        exception from the worker."""
+        win = tk.Toplevel(self.root)
+        win.title(title)
+        win.geometry("320x90")
+        tk.Label(win, text=title, font=("Arial", 10)).pack(pady=10)
+        bar = ttk.Progressbar(win, mode="indeterminate", length=280)
+        bar.pack(pady=5)
+        bar.start(10)
+
+        errors = []
+        results = []
+
+        def worker():
+            try:
+                results.append(work_fn())
+            except Exception as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                win.after(100, poll)
+            else:
+                win.destroy()
+
+        win.after(100, poll)
+        win.wait_window()
+
+        if errors:
+            raise errors[0]
+        return results[0] if results else None
+
+    def _build_preview_window(self):
+        """Create the preview window and all of its widgets exactly once.
+
+        show_preview_dialog only repopulates them on later files, so the
+        Double-1/Button-3 bindings and the context menu are installed a
+        single time instead of piling up on every invocation. Per-call data
+        lives in self._preview_state, which the handlers read.
+        """
+        state = self._preview_state
+
+        win = tk.Toplevel(self.root)
+        win.title("Column Mapping Preview & Edit")
+        win.geometry("850x700")
+        win.withdraw()
 
-        editable_mapping = column_mapping.copy()
-        proceed = [False]
-        add_manufacturer_real = tk.BooleanVar(value=False)
+        add_manufacturer_real = tk.BooleanVar(master=win, value=False)
+        manufacturer_var = tk.StringVar(master=win, value="Texas Instruments")
+        show_original = tk.BooleanVar(master=win, value=True)
+        # Bumped by the Proceed/Cancel handlers; show_preview_dialog blocks
+        # on wait_variable instead of wait_window so the window survives.
+        done_var = tk.IntVar(master=win, value=0)
 
         def on_proceed():
-            proceed[0] = True
-            # Store the manufacturer selection and checkbox state
-            proceed.append(add_manufacturer_real.get())
-            proceed.append(manufacturer_var.get())
-            root.quit()
+            state["proceed"] = True
+            state["add_manufacturer"] = add_manufacturer_real.get()
+            state["manufacturer"] = manufacturer_var.get()
+            done_var.set(done_var.get() + 1)
 
         def on_cancel():
-            root.quit()
+            state["proceed"] = False
+            done_var.set(done_var.get() + 1)
+
+        # Closing the window counts as cancel; the window is only hidden.
+        win.protocol("WM_DELETE_WINDOW", on_cancel)
 
         def on_edit(event):
             """Handle editing of the 'Mapped To' column."""
@@ -781,15 +1397,16 @@ class InteractiveColumnMapper:
 
             item = mapped_tree.item(item_id)
             original_col = item['values'][0]
-            
+
             new_name = simpledialog.askstring(
                 "Edit Mapping",
                 f"Enter new standard name for '{original_col}':",
-                initialvalue=editable_mapping.get(original_col, "")
+                initialvalue=state["mapping"].get(original_col, ""),
+                parent=win
             )
 
             if new_name is not None:
-                editable_mapping[original_col] = new_name
+                state["mapping"][original_col] = new_name
                 mapped_tree.item(item_id, values=(original_col, new_name, "Manual Edit"))
 
         def copy_hyperlink(event):
@@ -805,10 +1422,15 @@ class InteractiveColumnMapper:
             mapped_col = item['values'][1]
 
             if "link" in mapped_col.lower() or "url" in mapped_col.lower():
+                df_formulas = state["df_formulas"]
+                if df_formulas is None:
+                    messagebox.showinfo("Not Available",
+                                        "No hyperlink data was loaded for this file.")
+                    return
                 try:
                     hyperlink = df_formulas.loc[item_index, original_col]
-                    root.clipboard_clear()
-                    root.clipboard_append(hyperlink)
+                    win.clipboard_clear()
+                    win.clipboard_append(hyperlink)
                     messagebox.showinfo("Copied", f"Copied to clipboard:\n{hyperlink}")
                 except (IndexError, KeyError):
                     messagebox.showwarning("Empty Cell", f"The cell in column '{original_col}' at this row is empty or could not be found.")
@@ -820,77 +1442,127 @@ class InteractiveColumnMapper:
         def show_context_menu(event):
             context_menu.post(event.x_root, event.y_root)
 
-        notebook = ttk.Notebook(root)
+        notebook = ttk.Notebook(win)
         notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        if editable_mapping:
-            mapped_frame = ttk.Frame(notebook)
-            notebook.add(mapped_frame, text=f"Mapped Columns ({len(editable_mapping)})")
+        mapped_frame = ttk.Frame(notebook)
+        notebook.add(mapped_frame, text="Mapped Columns")
 
-            instructions_frame = tk.Frame(mapped_frame)
-            instructions_frame.pack(pady=5)
-            tk.Label(instructions_frame, text="Double-click a row to edit.", font=("Arial", 9, "italic")).pack(side=tk.LEFT, padx=5)
-            tk.Label(instructions_frame, text="Right-click for options.", font=("Arial", 9, "italic")).pack(side=tk.LEFT, padx=5)
+        instructions_frame = tk.Frame(mapped_frame)
+        instructions_frame.pack(pady=5)
+        tk.Label(instructions_frame, text="Double-click a row to edit.", font=("Arial", 9, "italic")).pack(side=tk.LEFT, padx=5)
+        tk.Label(instructions_frame, text="Right-click for options.", font=("Arial", 9, "italic")).pack(side=tk.LEFT, padx=5)
 
-            columns = ("Original", "Mapped To", "Confidence")
-            mapped_tree = ttk.Treeview(mapped_frame, columns=columns, show="headings", height=15)
+        columns = ("Original", "Mapped To", "Confidence")
+        mapped_tree = ttk.Treeview(mapped_frame, columns=columns, show="headings", height=15)
 
-            for col in columns:
-                mapped_tree.heading(col, text=col)
-                mapped_tree.column(col, width=270)
+        def sort_by(col):
+            """Re-sort the populated tree with move() only - no value
+            recomputation and no reinsertion."""
+            ensure_all_rows()
+            sort_state = state["sort"]
+            descending = not (sort_state["col"] == col and sort_state["desc"])
+            sort_state["col"] = col
+            sort_state["desc"] = descending
+            idx = columns.index(col)
+            items = [(mapped_tree.item(i)["values"][idx], i)
+                     for i in mapped_tree.get_children("")]
+            if col == "Confidence":
+                def key(pair):
+                    try:
+                        return float(str(pair[0]).rstrip('%'))
+                    except ValueError:
+                        return -1.0
+                items.sort(key=key, reverse=descending)
+            else:
+                items.sort(key=lambda pair: str(pair[0]).lower(), reverse=descending)
+            for pos, (_, item) in enumerate(items):
+                mapped_tree.move(item, "", pos)
 
-            for original, mapped in editable_mapping.items():
-                score = mapping_scores.get(original, "N/A")
-                confidence = f"{score:.1f}%" if isinstance(score, (int, float)) else score
-                mapped_tree.insert("", tk.END, values=(original, mapped, confidence))
+        for col in columns:
+            mapped_tree.heading(col, text=col, command=lambda c=col: sort_by(c))
+            # stretch=False keeps window resizes from re-laying-out cells
+            mapped_tree.column(col, width=270, stretch=False)
 
-            mapped_tree.bind("<Double-1>", on_edit)
-            mapped_tree.bind("<Button-3>", show_context_menu)
+        # For very wide column maps, start with the "Original" column
+        # hidden: two displayed text cells per row instead of three makes
+        # the initial layout noticeably faster. A checkbutton reveals it.
+        def toggle_original():
+            mapped_tree.configure(
+                displaycolumns=columns if show_original.get()
+                else ("Mapped To", "Confidence"))
 
-            context_menu = tk.Menu(root, tearoff=0)
-            context_menu.add_command(label="Copy Hyperlink", command=lambda: copy_hyperlink(None))
+        tk.Checkbutton(instructions_frame, text="Show original names",
+                       variable=show_original,
+                       command=toggle_original).pack(side=tk.LEFT, padx=5)
 
-            mapped_scrollbar = ttk.Scrollbar(mapped_frame, orient=tk.VERTICAL, command=mapped_tree.yview)
-            mapped_tree.configure(yscrollcommand=mapped_scrollbar.set)
-            
-            mapped_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            mapped_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtualized population: only materialize rows as the user
+        # scrolls toward them, so a 2k-column sheet never pays for
+        # offscreen Treeview items it may never look at.
+        def insert_chunk(count=200):
+            rows = state["rows"]
+            start = state["populated"]
+            for values in rows[start:start + count]:
+                mapped_tree.insert("", tk.END, values=values)
+            state["populated"] = min(start + count, len(rows))
 
-        if unmapped_columns:
-            unmapped_frame = ttk.Frame(notebook)
-            notebook.add(unmapped_frame, text=f"Unmapped Columns ({len(unmapped_columns)})")
-            
-            unmapped_listbox = tk.Listbox(unmapped_frame, font=("Arial", 10))
-            for col in unmapped_columns:
-                unmapped_listbox.insert(tk.END, col)
-            
-            unmapped_scroll = tk.Scrollbar(unmapped_frame, orient=tk.VERTICAL, command=unmapped_listbox.yview)
-            unmapped_listbox.configure(yscrollcommand=unmapped_scroll.set)
-            
-            unmapped_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            unmapped_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        def ensure_all_rows():
+            """Materialize everything (needed before a global re-sort)."""
+            while state["populated"] < len(state["rows"]):
+                insert_chunk(1000)
+
+        def _on_tree_scroll(first, last):
+            mapped_scrollbar.set(first, last)
+            if float(last) > 0.9 and state["populated"] < len(state["rows"]):
+                insert_chunk()
+
+        mapped_tree.bind("<Double-1>", on_edit)
+        mapped_tree.bind("<Button-3>", show_context_menu)
+
+        context_menu = tk.Menu(win, tearoff=0)
+        context_menu.add_command(label="Copy Hyperlink", command=lambda: copy_hyperlink(None))
+
+        mapped_scrollbar = ttk.Scrollbar(mapped_frame, orient=tk.VERTICAL, command=mapped_tree.yview)
+        mapped_tree.configure(yscrollcommand=_on_tree_scroll)
+
+        mapped_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        mapped_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        unmapped_frame = ttk.Frame(notebook)
+        notebook.add(unmapped_frame, text="Unmapped Columns")
+
+        # listvariable lets show_preview_dialog swap the whole item list in
+        # a single Tcl call instead of inserting per item
+        unmapped_var = tk.StringVar(master=win)
+        unmapped_listbox = tk.Listbox(unmapped_frame, font=("Arial", 10),
+                                      listvariable=unmapped_var)
+
+        unmapped_scroll = tk.Scrollbar(unmapped_frame, orient=tk.VERTICAL, command=unmapped_listbox.yview)
+        unmapped_listbox.configure(yscrollcommand=unmapped_scroll.set)
+
+        unmapped_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        unmapped_scroll.pack(side=tk.RIGHT, fill=tk.Y)
 
         # Add Manufacturer_real checkbox
-        manufacturer_frame = tk.Frame(root)
+        manufacturer_frame = tk.Frame(win)
         manufacturer_frame.pack(pady=5)
-        
-        tk.Checkbutton(manufacturer_frame, text="Add 'Manufacturer_real' column", 
+
+        tk.Checkbutton(manufacturer_frame, text="Add 'Manufacturer_real' column",
                       variable=add_manufacturer_real, font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-        
+
         # Manufacturer selection dropdown
         manufacturer_label = tk.Label(manufacturer_frame, text="Select Manufacturer:", font=("Arial", 10))
         manufacturer_label.pack(side=tk.LEFT, padx=10)
-        
-        manufacturer_var = tk.StringVar(value="Texas Instruments")
-        manufacturer_dropdown = ttk.Combobox(manufacturer_frame, textvariable=manufacturer_var, 
-                                           values=["TI", "ADI", "Infineon", 
-                                                  "ST", "Onsemi", "Microchip", 
+
+        manufacturer_dropdown = ttk.Combobox(manufacturer_frame, textvariable=manufacturer_var,
+                                           values=["TI", "ADI", "Infineon",
+                                                  "ST", "Onsemi", "Microchip",
                                                   "Broadcom", "NXP", "Toshiba", "Renesas Electronics",
-                                                  "Seiko Epson", "Marvell Technology", "Maxim Integrated", 
+                                                  "Seiko Epson", "Marvell Technology", "Maxim Integrated",
                                                   "Mitsubishi Electric", "ABB", "Fuji Electric", "Semikron Danfoss",
                                                   "Vishay", "Hitachi", "Littelfuse", "ROHM", "Custom..."])
         manufacturer_dropdown.pack(side=tk.LEFT, padx=5)
-        
+
         def on_manufacturer_change(event):
             if manufacturer_var.get() == "Custom...":
                 custom_name = simpledialog.askstring("Custom Manufacturer", "Enter manufacturer name:")
@@ -898,29 +1570,122 @@ class InteractiveColumnMapper:
                     manufacturer_var.set(custom_name)
                 else:
                     manufacturer_var.set("TI")
-        
+
         manufacturer_dropdown.bind("<<ComboboxSelected>>", on_manufacturer_change)
-        
-        button_frame = tk.Frame(root)
+
+        button_frame = tk.Frame(win)
         button_frame.pack(pady=10)
-        
-        tk.Button(button_frame, text="Proceed with Mapping", command=on_proceed, 
+
+        tk.Button(button_frame, text="Proceed with Mapping", command=on_proceed,
                  bg="green", fg="white", font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=10)
         tk.Button(button_frame, text="Cancel", command=on_cancel).pack(side=tk.LEFT, padx=10)
-        
-        summary_text = f"Ready to map {len(editable_mapping)} columns"
+
+        summary_label = tk.Label(win, text="", font=("Arial", 10))
+        summary_label.pack(pady=5)
+
+        self._preview = {
+            "win": win,
+            "notebook": notebook,
+            "mapped_frame": mapped_frame,
+            "unmapped_frame": unmapped_frame,
+            "mapped_tree": mapped_tree,
+            "unmapped_listbox": unmapped_listbox,
+            "unmapped_var": unmapped_var,
+            "summary_label": summary_label,
+            "add_manufacturer_real": add_manufacturer_real,
+            "manufacturer_var": manufacturer_var,
+            "show_original": show_original,
+            "toggle_original": toggle_original,
+            "insert_chunk": insert_chunk,
+            "done_var": done_var,
+        }
+
+    def show_preview_dialog(self, df_formulas, column_mapping, unmapped_columns, mapping_scores):
+        """Show preview of column mappings, allow editing, and copy hyperlinks."""
+        # Nothing mapped means nothing to proceed with - skip the whole
+        # window dance for degenerate inputs.
+        if not column_mapping:
+            print("No columns were mapped - nothing to preview.")
+            return False, None, None, None
+
+        if self._preview is None:
+            self._build_preview_window()
+        pv = self._preview
+        state = self._preview_state
+
+        # Per-call data the one-time handlers read
+        state["mapping"] = column_mapping.copy()
+        state["df_formulas"] = df_formulas
+        state["proceed"] = False
+        state["add_manufacturer"] = None
+        state["manufacturer"] = None
+        state["populated"] = 0
+        state["sort"] = {"col": "Confidence", "desc": True}
+
+        # Format every confidence string once up front; row builds and
+        # any later re-render read the cache instead of re-running a
+        # float format + isinstance check per row.
+        score_cache = {}
+        confidence_cache = {}
+        for original, score in mapping_scores.items():
+            if isinstance(score, (int, float)):
+                score_cache[original] = float(score)
+                confidence_cache[original] = f"{score:.1f}%"
+            else:
+                score_cache[original] = 0.0
+                confidence_cache[original] = str(score)
+
+        # Precompute the value tuples once, sorted by confidence descending
+        # so risky low-confidence mappings group together for review.
+        state["rows"] = sorted(
+            ((original, mapped, confidence_cache.get(original, "N/A"))
+             for original, mapped in state["mapping"].items()),
+            key=lambda t: -score_cache.get(t[0], 0.0))
+
+        win = pv["win"]
+        mapped_tree = pv["mapped_tree"]
+
+        # Repopulate the reused widgets for this file
+        children = mapped_tree.get_children("")
+        if children:
+            mapped_tree.delete(*children)
+        pv["notebook"].tab(pv["mapped_frame"],
+                           text=f"Mapped Columns ({len(state['mapping'])})")
+        pv["show_original"].set(len(state["mapping"]) <= 300)
+        pv["toggle_original"]()
+
+        # One listvariable assignment replaces the old delete + chunked
+        # insert loop: Tk rebuilds the whole item list in a single call
+        pv["unmapped_var"].set([str(c) for c in unmapped_columns])
         if unmapped_columns:
-            summary_text += f" ({len(unmapped_columns)} will remain unmapped)"
-        
-        tk.Label(root, text=summary_text, font=("Arial", 10)).pack(pady=5)
-        
-        root.mainloop()
-        root.destroy()
-        
-        if proceed[0]:
-            return proceed[0], editable_mapping, proceed[1], proceed[2]  # proceed, mapping, add_manufacturer_real, manufacturer_name
+            pv["notebook"].add(pv["unmapped_frame"],
+                               text=f"Unmapped Columns ({len(unmapped_columns)})")
         else:
-            return proceed[0], None, None, None
+            pv["notebook"].hide(pv["unmapped_frame"])
+
+        pv["add_manufacturer_real"].set(False)
+        pv["manufacturer_var"].set("Texas Instruments")
+
+        summary_text = f"Ready to map {len(state['mapping'])} columns"
+        if unmapped_columns:
+            summary_text += f" ({len(unmapped_columns)} will remain unmapped)"
+        pv["summary_label"].configure(text=summary_text)
+
+        win.deiconify()
+        win.lift()
+        # after_idle defers the first chunk until the window has laid out
+        # and painted, so it appears instantly even with thousands of rows
+        # queued behind it.
+        win.after_idle(pv["insert_chunk"])
+
+        # Block until Proceed/Cancel/close; the window is hidden, not
+        # destroyed, so everything is reusable for the next file.
+        win.wait_variable(pv["done_var"])
+        win.withdraw()
+
+        if state["proceed"]:
+            return True, state["mapping"], state["add_manufacturer"], state["manufacturer"]
+        return False, None, None, None
     
     def run_interactive(self):
         """Run the interactive version continuously"""
@@ -949,7 +1714,17 @@ class InteractiveColumnMapper:
             
             # Step 2: Get sheet names and let user select
             print("\nStep 2: Reading Excel file...")
-            sheet_names = self.get_sheet_names(input_file)
+            # One policy object per format instead of is_csv branches at
+            # every step; the workbook handle opens once and is reused for
+            # the sheet list and the header read.
+            file_io = _file_io(input_file)
+            is_csv = file_io.is_csv
+            try:
+                excel_file = file_io.open_handle(input_file)
+                sheet_names = file_io.sheet_names(input_file, excel_file)
+            except Exception as e:
+                print(f"Error reading file: {str(e)}")
+                sheet_names = []
             
             if not sheet_names:
                 print("Could not read Excel file or no sheets found.")
@@ -981,33 +1756,39 @@ class InteractiveColumnMapper:
             
             # Step 4: Load and analyze the file
             print("\nStep 4: Analyzing columns...")
-            try:
-                # Check if it's a CSV file
-                is_csv = input_file.lower().endswith('.csv')
-                
-                if is_csv:
-                    # For CSV files, read directly with pandas
-                    df_values = pd.read_csv(input_file)
-                    # Create a dummy df_formulas for CSV (since no formulas)
-                    df_formulas = df_values.copy()
-                    print("Processing CSV file...")
+
+            def _analyze():
+                """Parse the header (and formula pass if needed) and run the
+                fuzzy mapping; executed off the Tk thread so the window stays
+                responsive while pandas/openpyxl hold the disk."""
+                # Re-runs of the same file/sheet (e.g. trying another
+                # threshold) come straight from the session cache.
+                cache_key, cached = self._cache_get(input_file, selected_sheet)
+                if cached is not None:
+                    header_df, df_formulas = cached
+                    print("Reusing cached parse for this file...")
                 else:
-                    # For Excel files, read with openpyxl to get formulas
-                    import openpyxl
-                    workbook = openpyxl.load_workbook(input_file, data_only=False)
-                    sheet = workbook[selected_sheet]
-                    data = []
-                    for row in sheet.iter_rows(values_only=True):
-                        data.append(list(row))
-                    df_formulas = pd.DataFrame(data[1:], columns=data[0])
-
-                    # Read with pandas for values
-                    df_values = pd.read_excel(input_file, sheet_name=selected_sheet)
-                    print("Processing Excel file...")
-
-                column_mapping, unmapped_columns, mapping_scores = self.mapper.map_columns(df_values, threshold)
-                
-                print(f"Found {len(df_values.columns)} columns total")
+                    # Mapping only needs the column names, so read just the
+                    # header row here; the full sheet is read later, in
+                    # Step 7, once the user has confirmed the mapping. The
+                    # formula pass runs only when the header shows
+                    # hyperlink columns (and never for CSV).
+                    header_df = file_io.read_header(input_file, selected_sheet,
+                                                    excel_file)
+                    df_formulas = file_io.read_formulas(input_file, selected_sheet,
+                                                        header_df)
+                    self._cache_put(cache_key, (header_df, df_formulas))
+                    print(f"Processing {'CSV' if is_csv else 'Excel'} file...")
+
+                mapping = self.mapper.map_columns(header_df, threshold)
+                return (header_df, df_formulas) + mapping
+
+            try:
+                (header_df, df_formulas, column_mapping,
+                 unmapped_columns, mapping_scores) = self._run_with_progress(
+                    _analyze, "Analyzing columns...")
+
+                print(f"Found {len(header_df.columns)} columns total")
                 print(f"Mapped: {len(column_mapping)} columns")
                 print(f"Unmapped: {len(unmapped_columns)} columns")
                 
@@ -1031,16 +1812,10 @@ class InteractiveColumnMapper:
             
             # Step 6: Select output location
             print("\nStep 6: Select output location...")
-            input_name = Path(input_file).stem
-            is_csv = input_file.lower().endswith('.csv')
-            
+            default_output = Path(input_file).stem + file_io.default_suffix
             if is_csv:
-                default_output = f"{input_name}_mapped.csv"
-                # For CSV files, show CSV save dialog
                 output_file = self.select_csv_output_location(default_output)
             else:
-                default_output = f"{input_name}_mapped.xlsx"
-                # For Excel files, show Excel save dialog
                 output_file = self.select_output_location(default_output)
             
             if not output_file:
@@ -1052,21 +1827,26 @@ class InteractiveColumnMapper:
             # Step 7: Process and save
             print("\nStep 7: Processing and saving...")
             try:
-                mapped_df = df_values.rename(columns=final_mapping)
-                
-                # Add Manufacturer_real column if requested
-                if add_manufacturer_real:
-                    mapped_df['Manufacturer_real'] = manufacturer_name
-                    print(f"Added 'Manufacturer_real' column filled with: {manufacturer_name}")
-                
-                # Save based on output file extension
-                if output_file.lower().endswith('.csv'):
-                    mapped_df.to_csv(output_file, index=False)
-                    print("Saved as CSV file")
-                else:
-                    mapped_df.to_excel(output_file, index=False)
-                    print("Saved as Excel file")
+                def _read_and_save():
+                    # The full read happens only now, after the user confirmed,
+                    # through the shared save helper (streams Excel-to-Excel).
+                    if add_manufacturer_real:
+                        print(f"Added 'Manufacturer_real' column filled with: {manufacturer_name}")
+                    _apply_mapping_and_save(
+                        input_file, None if is_csv else selected_sheet,
+                        final_mapping, output_file,
+                        extra_column='Manufacturer_real' if add_manufacturer_real else None,
+                        extra_value=manufacturer_name if add_manufacturer_real else None)
+                    if output_file.lower().endswith('.csv'):
+                        print("Saved as CSV file")
+                    else:
+                        print("Saved as Excel file")
                 
+
+                # Run the blocking read+write on a worker thread so the
+                # UI stays responsive and shows progress while saving.
+                self._run_with_progress(_read_and_save, "Saving mapped file...")
+
                 print(f"\n✅ SUCCESS!")
                 print(f"Mapped file saved as: {output_file}")
                 print(f"Columns mapped: {len(final_mapping)}")